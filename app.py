@@ -3,7 +3,7 @@ import logging
 import sys
 from datetime import datetime
 from typing import Optional, Dict, Any
-from utils.data_fetcher import ExchangeManager
+from utils.data_fetcher import get_exchange_manager
 from styles.theme import apply_custom_theme
 from components.sidebar import render_sidebar
 from components.altcoin_analysis import render_altcoin_analysis
@@ -39,7 +39,7 @@ def initialize_session_state() -> bool:
             # Initialize other session state variables
             st.session_state.update({
                 'initialized': True,
-                'exchange_manager': ExchangeManager(),
+                'exchange_manager': get_exchange_manager(),
                 'last_update': datetime.now(),
                 'supported_exchanges': ['kraken', 'kucoin', 'binance'],
                 'selected_timeframe': '1d',
@@ -140,7 +140,7 @@ def main():
                 )
                 
                 if selected_symbol and timeframe:
-                    exchange_manager = ExchangeManager()
+                    exchange_manager = get_exchange_manager()
                     data = exchange_manager.get_historical_data(selected_symbol, timeframe)
                     
                     if not data.empty:
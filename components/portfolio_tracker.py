@@ -5,11 +5,11 @@ import plotly.express as px
 from datetime import datetime, timedelta
 import numpy as np
 from typing import Dict, List, Optional
-from utils.data_fetcher import ExchangeManager
+from utils.data_fetcher import get_exchange_manager
 
 class PortfolioTracker:
     def __init__(self):
-        self.exchange_manager = ExchangeManager()
+        self.exchange_manager = get_exchange_manager()
         
     def initialize_portfolio(self):
         if 'portfolio' not in st.session_state:
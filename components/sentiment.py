@@ -1,6 +1,6 @@
 import streamlit as st
 import plotly.graph_objects as go
-from utils.sentiment_analyzer import SentimentAnalyzer
+from utils.sentiment_analyzer import get_analyzer, get_crypto_news_sentiment
 from datetime import datetime
 
 def render_sentiment_analysis(selected_coins):
@@ -9,9 +9,9 @@ def render_sentiment_analysis(selected_coins):
         st.warning("Please select at least one cryptocurrency to analyze sentiment.")
         return
     
-    # Initialize analyzer with error handling
+    # Warm the shared analyzer with error handling
     try:
-        analyzer = SentimentAnalyzer()
+        get_analyzer()
     except Exception as e:
         st.error("⚠️ Failed to initialize sentiment analysis")
         st.info("💡 Please try refreshing the page or check your internet connection.")
@@ -32,7 +32,7 @@ def render_sentiment_analysis(selected_coins):
                 st.markdown(f"### {coin.upper()}")
                 
                 with st.spinner(f"Analyzing sentiment for {coin}..."):
-                    sentiment_data = analyzer.get_crypto_news_sentiment(coin.lower())
+                    sentiment_data = get_crypto_news_sentiment(coin.lower())
                     
                     if sentiment_data.get('error'):
                         if sentiment_data.get('failed_sources'):
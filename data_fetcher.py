@@ -1,70 +1,259 @@
+import numpy as np
 import pandas as pd
-import ccxt
+import ccxt.async_support as ccxt_async
 from pycoingecko import CoinGeckoAPI
 import streamlit as st
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, List
 from datetime import datetime, timedelta
+from functools import lru_cache
+import asyncio
+import sys
+import types
+import threading
 import time
 import random
+import requests
+from requests.adapters import HTTPAdapter
+from utils.api_helpers import retry_api_call, handle_api_error
+from utils.cache import disk_cache
 
-# Cryptocurrency symbol mapping with lowercase symbols
-CRYPTO_SYMBOLS = {
-    'bitcoin': 'btc/usdt',
-    'ethereum': 'eth/usdt',
-    'cardano': 'ada/usdt',
-    'binancecoin': 'bnb/usdt',
-    'solana': 'sol/usdt'
-}
+# Cryptocurrency symbol mapping with lowercase symbols; frozen and interned
+# so hot-path lookups hash stable keys and the map can't be mutated
+CRYPTO_SYMBOLS = types.MappingProxyType({
+    sys.intern(coin_id): symbol
+    for coin_id, symbol in {
+        'bitcoin': 'btc/usdt',
+        'ethereum': 'eth/usdt',
+        'cardano': 'ada/usdt',
+        'binancecoin': 'bnb/usdt',
+        'solana': 'sol/usdt'
+    }.items()
+})
+
+# The orjson JSON-decode acceleration for requests and ccxt is installed as
+# an import side effect of utils.api_helpers, shared with utils.data_fetcher
+
+# Shared HTTP session so repeated API calls reuse pooled keep-alive connections
+# instead of paying a TCP+TLS handshake each time
+_http_session = requests.Session()
+_http_session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=20))
 
 # Initialize APIs
 cg = CoinGeckoAPI()
+cg.session = _http_session
+
+# Shared event loop so connection pools survive across fetch calls.
+# Streamlit runs each session in its own thread and run_until_complete is
+# not re-entrant, so every entry into the loop goes through _run_on_loop.
+_loop = asyncio.new_event_loop()
+_loop_lock = threading.Lock()
+
+def _run_on_loop(coro):
+    """Drive the shared loop to completion, one caller at a time.
+
+    Two sessions fetching different coins would otherwise both call
+    run_until_complete and the loser would crash with "This event loop
+    is already running".
+    """
+    with _loop_lock:
+        return _loop.run_until_complete(coro)
+
+# Per-exchange symbol formatters; the default covers the uppercase majority
+_SYMBOL_FORMATTERS = {
+    'kucoin': lambda s: s.replace('/', '-')
+}
 
 def get_exchange_symbol(exchange_id: str, base_symbol: str) -> str:
-    """Convert base symbol to exchange-specific format with error handling."""
-    try:
-        if not base_symbol:
-            raise ValueError("Invalid base symbol")
-        
-        if exchange_id == 'kucoin':
-            return base_symbol.replace('/', '-')
-        return base_symbol.upper()  # Most exchanges prefer uppercase symbols
-    except Exception as e:
-        st.warning(f"Symbol conversion error: {str(e)}")
-        return base_symbol
+    """Convert base symbol to exchange-specific format."""
+    formatter = _SYMBOL_FORMATTERS.get(exchange_id)
+    return formatter(base_symbol) if formatter else base_symbol.upper()
 
-def init_exchanges() -> List[ccxt.Exchange]:
-    """Initialize multiple cryptocurrency exchanges with error handling."""
-    exchanges = []
+# Market listings change rarely; refresh the on-disk copy daily
+MARKETS_CACHE_TTL = 86400
+
+def init_exchanges() -> List[ccxt_async.Exchange]:
+    """Initialize multiple cryptocurrency exchanges, loading markets concurrently.
+
+    Market metadata is persisted to the disk cache per exchange so warm
+    starts skip the load_markets() download entirely.
+    """
     exchange_ids = ['kraken', 'coinbasepro', 'kucoin']
-    
+    candidates = []
+
     for exchange_id in exchange_ids:
         try:
-            exchange = getattr(ccxt, exchange_id)()
-            exchange.load_markets()  # Load market symbols
-            exchanges.append(exchange)
+            candidates.append(getattr(ccxt_async, exchange_id)())
         except Exception as e:
             st.warning(f"Failed to initialize {exchange_id}: {str(e)}")
-    
-    return exchanges
 
-# Initialize exchanges
-exchanges = init_exchanges()
+    loaded = []
+    to_load = []
+    for exchange in candidates:
+        cached_markets = disk_cache.get(f'markets:{exchange.id}', MARKETS_CACHE_TTL)
+        if cached_markets:
+            exchange.set_markets(cached_markets)
+            loaded.append(exchange)
+        else:
+            to_load.append(exchange)
 
-def retry_api_call(func, max_retries=3, delay=1):
-    """Retry API calls with exponential backoff."""
-    for attempt in range(max_retries):
-        try:
-            return func()
-        except Exception as e:
-            if attempt == max_retries - 1:
-                raise e
-            time.sleep(delay * (2 ** attempt))
-            continue
+    if not to_load:
+        return loaded
+
+    async def _load_all() -> List[ccxt_async.Exchange]:
+        results = await asyncio.gather(
+            *[exchange.load_markets() for exchange in to_load],
+            return_exceptions=True
+        )
+        for exchange, result in zip(to_load, results):
+            if isinstance(result, Exception):
+                st.warning(f"Failed to initialize {exchange.id}: {str(result)}")
+            else:
+                disk_cache.set(f'markets:{exchange.id}', exchange.markets)
+                loaded.append(exchange)
+        return loaded
+
+    return _run_on_loop(_load_all())
+
+_exchanges: Optional[List[ccxt_async.Exchange]] = None
+_exchanges_lock = threading.Lock()
+
+def get_exchanges() -> List[ccxt_async.Exchange]:
+    """Initialize the exchanges on first use and reuse them afterwards.
+
+    Running init_exchanges at import time blocked every import of this
+    module on the market downloads; lazy initialization defers that cost
+    to the first fetch and pays it once per process. Double-checked
+    locking keeps concurrent first calls from both running the
+    initialization (lru_cache doesn't serialize them), while warmed
+    calls — including those made from inside the event loop — skip the
+    lock entirely.
+    """
+    global _exchanges
+    if _exchanges is None:
+        with _exchanges_lock:
+            if _exchanges is None:
+                _exchanges = init_exchanges()
+    return _exchanges
+
+# Single-flight guard so concurrent identical fetches share one API call
+class _Flight:
+    """Outcome of one in-flight fetch, shared between leader and followers."""
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+_inflight_lock = threading.Lock()
+_inflight: Dict[tuple, _Flight] = {}
+
+def _single_flight(key: tuple, fetch):
+    """Run fetch once per key; concurrent callers share the first outcome.
+
+    Followers see exactly what the leader saw: the leader's exception is
+    re-raised in each follower rather than surfacing as a None result
+    that callers would choke on (and caches would store for a full TTL).
+    Each flight is dropped from the registry before its event fires, so
+    later calls start fresh instead of reading a stale result.
+    """
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        is_leader = flight is None
+        if is_leader:
+            flight = _Flight()
+            _inflight[key] = flight
+
+    if not is_leader:
+        flight.event.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    try:
+        flight.value = fetch()
+        return flight.value
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        flight.event.set()
+
+# Head start granted to the exchanges before CoinGecko joins the race
+COINGECKO_HEAD_START = 2.0
+
+async def _race_sources(coin_id: str, symbol: str, timeframe: str,
+                        limit: int, days: str) -> Optional[tuple]:
+    """Race all exchanges and CoinGecko concurrently; first success wins.
+
+    Returns a ('ohlcv', data) or ('coingecko', data) tuple so the caller
+    knows which payload shape it received.
+    """
+    async def _try_exchange(exchange):
+        exchange_symbol = get_exchange_symbol(exchange.id, symbol)
+        ohlcv = await exchange.fetch_ohlcv(exchange_symbol, timeframe, limit=limit)
+        if not ohlcv:
+            raise ValueError(f"No data returned by {exchange.id}")
+        return ('ohlcv', ohlcv)
+
+    async def _try_coingecko():
+        # Give the preferred exchange sources a short head start
+        await asyncio.sleep(COINGECKO_HEAD_START)
+        data = await asyncio.get_event_loop().run_in_executor(
+            None,
+            lambda: cg.get_coin_market_chart_by_id(
+                id=coin_id,
+                vs_currency='usd',
+                days=days
+            )
+        )
+        if not data:
+            raise ValueError("No data returned by CoinGecko")
+        return ('coingecko', data)
+
+    pending = {asyncio.ensure_future(_try_exchange(exchange)) for exchange in get_exchanges()}
+    pending.add(asyncio.ensure_future(_try_coingecko()))
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                st.warning(f"Data source error: {str(task.exception())}. Trying next source...")
+    finally:
+        for task in pending:
+            task.cancel()
     return None
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+@st.cache_resource(ttl=300, max_entries=32)  # Cache for 5 minutes
+@disk_cache.memoize(expire=300)
+def _cached_crypto_data(coin_id: str, days: str) -> pd.DataFrame:
+    """Resource-cached fetch; st.cache_resource returns the stored object
+    directly instead of pickling the DataFrame on every cache hit."""
+    return _single_flight(
+        ('crypto_data', coin_id, days),
+        lambda: _fetch_crypto_data(coin_id, days)
+    )
+
 def get_crypto_data(coin_id: str, days: str) -> pd.DataFrame:
+    """Fetch cryptocurrency data, deduplicating concurrent identical requests.
+
+    Returns a shallow copy so callers can add columns without mutating
+    the shared cached frame.
+    """
+    return _cached_crypto_data(coin_id, days).copy(deep=False)
+
+def _fetch_crypto_data(coin_id: str, days: str) -> pd.DataFrame:
     """Fetch cryptocurrency data using multiple exchanges with fallback."""
+    # Warm the exchange list before entering the loop: initialization
+    # itself drives the loop and can't run from inside it
+    get_exchanges()
+    return _run_on_loop(_fetch_crypto_data_async(coin_id, days))
+
+async def _fetch_crypto_data_async(coin_id: str, days: str) -> pd.DataFrame:
+    """Async body of the fetch so multi-coin callers can overlap requests."""
     try:
         # Get symbol from mapping with validation
         symbol = CRYPTO_SYMBOLS.get(coin_id.lower())
@@ -72,132 +261,211 @@ def get_crypto_data(coin_id: str, days: str) -> pd.DataFrame:
             st.error(f"Unsupported cryptocurrency: {coin_id}")
             return pd.DataFrame()
 
-        # Convert days to milliseconds for CCXT
-        timeframe = '1d'
-        if int(days) <= 7:
-            timeframe = '1h'
-        
-        for exchange in exchanges:
-            try:
-                # Get exchange-specific symbol format
-                exchange_symbol = get_exchange_symbol(exchange.id, symbol)
-                
-                def fetch_data():
-                    return exchange.fetch_ohlcv(
-                        exchange_symbol,
-                        timeframe,
-                        limit=int(days) * (24 if timeframe == '1h' else 1)
-                    )
-                
-                # Fetch OHLCV data with retry logic
-                ohlcv = retry_api_call(fetch_data)
-                
-                if ohlcv and len(ohlcv) > 0:
-                    # Create DataFrame
-                    df = pd.DataFrame(
-                        ohlcv,
-                        columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-                    )
-                    
-                    # Convert timestamp to datetime
-                    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                    df.set_index('timestamp', inplace=True)
-                    
-                    # Use close price as the main price
-                    df['price'] = df['close']
-                    
-                    return df[['price', 'volume']]
-                    
-            except Exception as e:
-                st.warning(f"Exchange {exchange.id} error: {str(e)}. Trying next exchange...")
-                continue
-        
-        # Fallback to CoinGecko
-        st.info("Using CoinGecko as fallback data source...")
-        data = retry_api_call(
-            lambda: cg.get_coin_market_chart_by_id(
-                id=coin_id,
-                vs_currency='usd',
-                days=days
-            )
+        # Parse days once, outside the hot path
+        days_i = int(days)
+        if days_i <= 0:
+            raise ValueError(f"Invalid days value: {days}")
+
+        timeframe = '1h' if days_i <= 7 else '1d'
+
+        # Race all exchanges and CoinGecko concurrently; first success wins
+        result = await _race_sources(
+            coin_id,
+            symbol,
+            timeframe,
+            days_i * (24 if timeframe == '1h' else 1),
+            days
         )
-        
-        if data:
+
+        if result is None:
+            return pd.DataFrame()
+
+        source, data = result
+
+        if source == 'ohlcv':
+            # One typed array avoids per-element dtype inference on construction;
+            # only close (as price) and volume are consumed, so the OHLC columns
+            # are never materialized and no block copy happens on return
+            arr = np.asarray(data, dtype=np.float64)
             df = pd.DataFrame({
-                'timestamp': [pd.to_datetime(ts, unit='ms') for ts, _ in data['prices']],
-                'price': [p for _, p in data['prices']],
-                'volume': [v for _, v in data['total_volumes']]
-            })
-            
-            df.set_index('timestamp', inplace=True)
+                'price': arr[:, 4].astype(np.float32),
+                'volume': arr[:, 5].astype(np.float32)
+            }, index=pd.to_datetime(arr[:, 0].astype('int64'), unit='ms'))
+            df.index.name = 'timestamp'
             return df
-            
+
+        # CoinGecko won the race
+        st.info("Using CoinGecko as data source...")
+
+        # Convert the [timestamp, value] pair lists in one vectorized pass
+        prices = np.asarray(data['prices'], dtype=np.float64)
+        volumes = np.asarray(data['total_volumes'], dtype=np.float64)
+
+        df = pd.DataFrame({
+            'price': prices[:, 1].astype(np.float32),
+            'volume': volumes[:, 1].astype(np.float32)
+        }, index=pd.to_datetime(prices[:, 0].astype('int64'), unit='ms'))
+        df.index.name = 'timestamp'
+        return df
+
     except Exception as e:
-        error_msg = _handle_api_error(e)
+        error_msg = handle_api_error(e)
         st.error(error_msg)
     
     return pd.DataFrame()
 
 @st.cache_data(ttl=300)
+def get_crypto_data_many(coin_ids: List[str], days: str) -> Dict[str, pd.DataFrame]:
+    """Fetch data for several coins at once, overlapping their network calls.
+
+    Dashboard views that previously looped get_crypto_data per coin pay
+    one wall-clock round-trip for the whole batch instead of N.
+    """
+    async def _gather():
+        return await asyncio.gather(
+            *[_fetch_crypto_data_async(coin_id, days) for coin_id in coin_ids],
+            return_exceptions=True
+        )
+
+    get_exchanges()
+    results = _run_on_loop(_gather())
+
+    frames: Dict[str, pd.DataFrame] = {}
+    for coin_id, result in zip(coin_ids, results):
+        if isinstance(result, Exception):
+            st.warning(f"Error fetching {coin_id}: {str(result)}")
+            frames[coin_id] = pd.DataFrame()
+        else:
+            frames[coin_id] = result
+    return frames
+
+@st.cache_data(ttl=60)
+def get_latest_prices(coin_ids: List[str]) -> Dict[str, float]:
+    """Fetch the latest spot price for several coins in one batch call.
+
+    Callers that only need current prices shouldn't pay N fetch_ohlcv
+    round-trips; one fetch_tickers call covers every symbol at once on
+    exchanges that support it, with a single CoinGecko simple-price
+    request as the fallback.
+    """
+    symbol_by_coin = {
+        coin_id: CRYPTO_SYMBOLS[coin_id.lower()]
+        for coin_id in coin_ids
+        if coin_id.lower() in CRYPTO_SYMBOLS
+    }
+    if not symbol_by_coin:
+        return {}
+
+    async def _fetch() -> Dict[str, float]:
+        for exchange in get_exchanges():
+            if not exchange.has.get('fetchTickers'):
+                continue
+            requested = {
+                coin_id: get_exchange_symbol(exchange.id, symbol)
+                for coin_id, symbol in symbol_by_coin.items()
+            }
+            try:
+                tickers = await exchange.fetch_tickers(list(requested.values()))
+            except Exception as e:
+                st.warning(f"Ticker batch failed on {exchange.id}: {str(e)}")
+                continue
+
+            prices = {
+                coin_id: float(tickers[exchange_symbol]['last'])
+                for coin_id, exchange_symbol in requested.items()
+                if tickers.get(exchange_symbol, {}).get('last') is not None
+            }
+            if prices:
+                return prices
+
+        # Fall back to CoinGecko's batch endpoint: still one HTTP call
+        data = await asyncio.get_event_loop().run_in_executor(
+            None,
+            lambda: cg.get_price(ids=list(symbol_by_coin), vs_currencies='usd')
+        )
+        return {
+            coin_id: float(quote['usd'])
+            for coin_id, quote in (data or {}).items()
+            if quote.get('usd') is not None
+        }
+
+    try:
+        get_exchanges()
+        return _run_on_loop(_fetch())
+    except Exception as e:
+        st.error(handle_api_error(e))
+        return {}
+
+@st.cache_resource(ttl=300, max_entries=32)
+@disk_cache.memoize(expire=300)
+def _cached_bitcoin_dominance(days: str) -> pd.DataFrame:
+    """Resource-cached dominance series; avoids the per-hit pickle round-trip."""
+    return _single_flight(
+        ('btc_dominance', days),
+        lambda: _fetch_bitcoin_dominance(days)
+    )
+
 def get_bitcoin_dominance(days: str) -> pd.DataFrame:
+    """Calculate Bitcoin dominance, deduplicating concurrent identical requests."""
+    return _cached_bitcoin_dominance(days).copy(deep=False)
+
+@st.cache_data(ttl=60)
+def _fetch_global_dominance() -> float:
+    """Fetch the current Bitcoin dominance percentage from CoinGecko.
+
+    Cached separately from the per-days DataFrame so changing the days
+    selector never triggers a fresh market-data request.
+    """
+    global_data = retry_api_call(
+        lambda: cg.get_coins_markets(
+            vs_currency='usd',
+            order='market_cap_desc',
+            per_page=100,
+            sparkline=False
+        )
+    )
+
+    if not global_data:
+        raise Exception("Failed to fetch market data")
+
+    # Aggregate market caps in one vectorized pass instead of per-coin Python loops
+    markets = pd.DataFrame(global_data, columns=['id', 'market_cap'])
+    market_caps = markets['market_cap'].astype('float64')
+    total_market_cap = market_caps.sum()
+    btc_caps = market_caps[markets['id'] == 'bitcoin']
+
+    if btc_caps.empty or not total_market_cap:
+        raise Exception("Invalid market cap data")
+
+    btc_market_cap = btc_caps.iloc[0]
+    return (btc_market_cap / total_market_cap * 100) if total_market_cap > 0 else 0
+
+@lru_cache(maxsize=32)
+def _daily_index(days: int, anchor: pd.Timestamp) -> pd.DatetimeIndex:
+    """Build (and memoize) a day-granularity index ending at anchor.
+
+    Anchoring to midnight keeps the cache key stable for a whole day,
+    unlike datetime.now() which changes on every call.
+    """
+    return pd.date_range(end=anchor, periods=days, freq='D')
+
+def _fetch_bitcoin_dominance(days: str) -> pd.DataFrame:
     """Calculate Bitcoin dominance using CoinGecko market data."""
     try:
-        # Get all coins market data
-        global_data = retry_api_call(
-            lambda: cg.get_coins_markets(
-                vs_currency='usd',
-                order='market_cap_desc',
-                per_page=100,
-                sparkline=False
-            )
-        )
-        
-        if not global_data:
-            raise Exception("Failed to fetch market data")
-        
-        # Calculate total market cap and Bitcoin market cap
-        total_market_cap = sum(coin['market_cap'] for coin in global_data if coin['market_cap'])
-        btc_data = next((coin for coin in global_data if coin['id'] == 'bitcoin'), None)
-        
-        if not btc_data or not total_market_cap:
-            raise Exception("Invalid market cap data")
-        
-        btc_market_cap = btc_data['market_cap']
-        dominance = (btc_market_cap / total_market_cap * 100) if total_market_cap > 0 else 0
-        
+        dominance = _fetch_global_dominance()
+
         # Create time series for the last N days
-        timestamps = pd.date_range(
-            end=datetime.now(),
-            periods=int(days),
-            freq='D'
+        timestamps = _daily_index(int(days), pd.Timestamp.now().normalize())
+
+        # Broadcast the scalar dominance without building a Python list
+        df = pd.DataFrame(
+            {'btc_dominance': np.full(len(timestamps), dominance, dtype=np.float32)},
+            index=timestamps
         )
-        
-        # Create DataFrame with the calculated dominance
-        df = pd.DataFrame({
-            'timestamp': timestamps,
-            'btc_dominance': [dominance] * len(timestamps)
-        })
-        
-        df.set_index('timestamp', inplace=True)
-        return df[['btc_dominance']]
+        df.index.name = 'timestamp'
+        return df
         
     except Exception as e:
-        error_msg = _handle_api_error(e)
+        error_msg = handle_api_error(e)
         st.error(error_msg)
-        return pd.DataFrame({'btc_dominance': []})
-
-def _handle_api_error(error: Exception) -> str:
-    """Handle API errors with detailed error messages."""
-    error_msg = str(error)
-    if "429" in error_msg:
-        return "Rate limit exceeded. Please wait a few minutes and try again."
-    elif "404" in error_msg:
-        return "Data not found. The requested cryptocurrency might not be supported."
-    elif "connection" in error_msg.lower():
-        return "Network connection error. Please check your internet connection and try again."
-    elif "forbidden" in error_msg.lower() or "restricted" in error_msg.lower():
-        return "Access denied. The service might be restricted in your region."
-    elif "timeout" in error_msg.lower():
-        return "Request timed out. The server might be experiencing high load."
-    else:
-        return f"API error: {error_msg}. Please try again later."
+        return pd.DataFrame({'btc_dominance': np.array([], dtype=np.float32)})
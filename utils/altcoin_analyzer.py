@@ -131,7 +131,7 @@ class AltcoinAnalyzer:
                 
             df = df.sort_values('market_cap', ascending=False).head(50)
             df['rank'] = range(1, len(df) + 1)
-            df['category'] = df['rank'].apply(self._assign_category)
+            df['category'] = self._assign_categories(df['rank'])
             
             return df
             
@@ -467,6 +467,18 @@ class AltcoinAnalyzer:
             return 'Mid Cap'
         else:
             return 'Lower Cap'
+
+    def _assign_categories(self, ranks: pd.Series) -> np.ndarray:
+        """Assign categories for a whole rank column in one vectorized pass."""
+        rank_values = ranks.to_numpy()
+        return np.select(
+            [
+                (rank_values >= 2) & (rank_values <= 10),
+                (rank_values >= 11) & (rank_values <= 25)
+            ],
+            ['Large Cap', 'Mid Cap'],
+            default='Lower Cap'
+        )
     
     def calculate_stair_stepping_strategy(self, capital: float = 10000) -> Dict:
         """Calculate stair-stepping strategy allocations and entry/exit points."""
@@ -0,0 +1,90 @@
+import time
+import random
+from typing import Optional
+
+import ccxt
+import requests
+
+try:
+    import orjson
+    import json as _stdlib_json
+
+    class _OrjsonShim:
+        """Rust-backed JSON decoding for requests; keep stdlib for encoding
+        since requests passes kwargs orjson.dumps doesn't accept."""
+        loads = staticmethod(orjson.loads)
+        dumps = staticmethod(_stdlib_json.dumps)
+
+    requests.models.complexjson = _OrjsonShim
+
+    def _on_json_response(self, response_body):
+        # ccxt's quoteJsonNumbers mode needs parse_float/parse_int hooks
+        # orjson doesn't offer; only the plain-decode path is accelerated
+        if self.quoteJsonNumbers:
+            return _stdlib_json.loads(response_body, parse_float=str, parse_int=str)
+        return orjson.loads(response_body)
+
+    # Patching the base class covers the sync and async exchange classes alike
+    ccxt.Exchange.on_json_response = _on_json_response
+except ImportError:
+    pass  # stdlib json parsing remains the fallback
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Extract a Retry-After duration from an API error, if the server sent one."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    retry_after = headers.get('Retry-After')
+    if retry_after is not None:
+        try:
+            return float(retry_after)
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def retry_api_call(func, max_retries=3, delay=0.5, cap=8.0):
+    """Retry API calls with decorrelated-jitter backoff, honouring Retry-After.
+
+    Each wait is drawn from [delay, 3 * previous wait] and capped, so
+    concurrent clients spread out instead of re-hitting the server in
+    lockstep, while a server-supplied Retry-After always takes priority.
+    """
+    sleep = delay
+    for attempt in range(max_retries):
+        try:
+            return func()
+        except ccxt.BadSymbol:
+            # Unsupported symbols won't succeed on retry; fail fast.
+            # ValueError must NOT short-circuit here: pycoingecko wraps
+            # every non-2xx body, including 429 rate limits, in
+            # ValueError, and those are exactly the calls the
+            # Retry-After handling below exists for.
+            raise
+        except Exception as e:
+            if attempt == max_retries - 1:
+                raise e
+            wait = retry_after_seconds(e)
+            if wait is None:
+                sleep = min(cap, random.uniform(delay, sleep * 3))
+                wait = sleep
+            time.sleep(wait)
+            continue
+    return None
+
+
+def handle_api_error(error: Exception) -> str:
+    """Handle API errors with detailed error messages."""
+    error_msg = str(error)
+    if "429" in error_msg:
+        return "Rate limit exceeded. Please wait a few minutes and try again."
+    elif "404" in error_msg:
+        return "Data not found. The requested cryptocurrency might not be supported."
+    elif "connection" in error_msg.lower():
+        return "Network connection error. Please check your internet connection and try again."
+    elif "forbidden" in error_msg.lower() or "restricted" in error_msg.lower():
+        return "Access denied. The service might be restricted in your region."
+    elif "timeout" in error_msg.lower():
+        return "Request timed out. The server might be experiencing high load."
+    else:
+        return f"API error: {error_msg}. Please try again later."
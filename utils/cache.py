@@ -0,0 +1,102 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import logging
+from functools import wraps
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default location for the shared on-disk cache database
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'altcoin_analyzer', 'data_cache.db'
+)
+
+
+class DiskCache:
+    """Disk-backed TTL cache so fetched market data survives process restarts.
+
+    Values are pickled into a small SQLite database. Streamlit's
+    @st.cache_data is per-process and lost on every restart; this layer
+    turns a warm restart into a local read instead of a fresh API call.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self._lock = threading.Lock()
+        self._conn = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache '
+                '(key TEXT PRIMARY KEY, created REAL, blob BLOB)'
+            )
+            self._conn.commit()
+        except Exception as e:
+            logger.warning(f"Disk cache unavailable, falling back to API-only mode: {str(e)}")
+            self._conn = None
+
+    def get(self, key: str, max_age: float) -> Optional[Any]:
+        """Return the cached value for key if younger than max_age seconds."""
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT created, blob FROM cache WHERE key = ?', (key,)
+                ).fetchone()
+            if row is None:
+                return None
+            created, blob = row
+            if time.time() - created > max_age:
+                return None
+            return pickle.loads(blob)
+        except Exception as e:
+            logger.warning(f"Error reading disk cache: {str(e)}")
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value under key, replacing any previous entry."""
+        if self._conn is None:
+            return
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO cache (key, created, blob) VALUES (?, ?, ?)',
+                    (key, time.time(), blob)
+                )
+                self._conn.commit()
+        except Exception as e:
+            logger.warning(f"Error writing disk cache: {str(e)}")
+
+    def memoize(self, expire: float) -> Callable:
+        """Decorator caching a function's result on disk for expire seconds.
+
+        Failed lookups (None or an empty DataFrame) are not cached so
+        transient API errors don't stick for a full TTL window.
+        """
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                key = (
+                    f"{func.__module__}.{func.__qualname__}:"
+                    f"{args!r}:{sorted(kwargs.items())!r}"
+                )
+                cached = self.get(key, expire)
+                if cached is not None:
+                    return cached
+
+                value = func(*args, **kwargs)
+                if value is not None and not getattr(value, 'empty', False):
+                    self.set(key, value)
+                return value
+            return wrapper
+        return decorator
+
+
+# Shared cache instance used by the data fetchers
+disk_cache = DiskCache()
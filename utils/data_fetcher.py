@@ -1,44 +1,264 @@
 import os
+import numpy as np
 import pandas as pd
 import ccxt
 from pycoingecko import CoinGeckoAPI
 import streamlit as st
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Final, List, Mapping, Tuple
 import logging
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import time
+import threading
+import types
+import random
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 import asyncio
 from .websocket_manager import websocket_manager, ConnectionState
+from .cache import disk_cache
+from .ratelimit import bucket_for
+from . import api_helpers  # installs the orjson JSON-decode shim on import
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Cryptocurrency symbol mapping
-CRYPTO_SYMBOLS = {
-    'bitcoin': {
-        'primary': 'BTC/USDT',
-        'alternatives': ['BTC/USD', 'XBT/USD'],
-        'regional_pairs': {
-            'NA': ['BTC/USD', 'BTC/USDT'],
-            'EU': ['BTC/EUR', 'BTC/USDT'],
-            'ASIA': ['BTC/USDT', 'BTC/JPY']
-        },
-        'coingecko_id': 'bitcoin'
-    },
-    'ethereum': {
-        'primary': 'ETH/USDT',
-        'alternatives': ['ETH/USD', 'ETH/BTC'],
-        'regional_pairs': {
-            'NA': ['ETH/USD', 'ETH/USDT'],
-            'EU': ['ETH/EUR', 'ETH/USDT'],
-            'ASIA': ['ETH/USDT', 'ETH/JPY']
-        },
-        'coingecko_id': 'ethereum'
-    }
-}
+@dataclass(frozen=True, slots=True)
+class SymbolConfig:
+    """Static per-coin trading configuration.
+
+    Frozen slots give direct attribute access in the hot paths instead
+    of chained dict lookups, with no per-instance __dict__.
+    """
+    primary: str
+    alternatives: Tuple[str, ...]
+    regional_pairs: Mapping[str, Tuple[str, ...]]
+    coingecko_id: str
+
+# Cryptocurrency symbol mapping; frozen so no call site can add or
+# replace entries at runtime
+CRYPTO_SYMBOLS: Final[Mapping[str, SymbolConfig]] = types.MappingProxyType({
+    'bitcoin': SymbolConfig(
+        primary='BTC/USDT',
+        alternatives=('BTC/USD', 'XBT/USD'),
+        regional_pairs=types.MappingProxyType({
+            'NA': ('BTC/USD', 'BTC/USDT'),
+            'EU': ('BTC/EUR', 'BTC/USDT'),
+            'ASIA': ('BTC/USDT', 'BTC/JPY')
+        }),
+        coingecko_id='bitcoin'
+    ),
+    'ethereum': SymbolConfig(
+        primary='ETH/USDT',
+        alternatives=('ETH/USD', 'ETH/BTC'),
+        regional_pairs=types.MappingProxyType({
+            'NA': ('ETH/USD', 'ETH/USDT'),
+            'EU': ('ETH/EUR', 'ETH/USDT'),
+            'ASIA': ('ETH/USDT', 'ETH/JPY')
+        }),
+        coingecko_id='ethereum'
+    )
+})
+
+@dataclass(frozen=True, slots=True)
+class OHLCV:
+    """Columnar (structure-of-arrays) view of an OHLCV series.
+
+    One typed block per column instead of a DataFrame: cheaper to build
+    from a ccxt response and friendlier to vectorized indicator code.
+    to_dataframe() adapts for display and legacy consumers.
+    """
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_ccxt(cls, rows: List[List[float]]) -> "OHLCV":
+        """Build from a ccxt fetch_ohlcv response in one typed pass."""
+        arr = np.asarray(rows, dtype=np.float64)
+        return cls(
+            arr[:, 0].astype('int64').astype('datetime64[ms]'),
+            *(arr[:, i].astype(np.float32) for i in range(1, 6))
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Adapt the columns into the DataFrame shape chart code expects."""
+        return pd.DataFrame(
+            {
+                'open': self.open,
+                'high': self.high,
+                'low': self.low,
+                'close': self.close,
+                'volume': self.volume
+            },
+            index=pd.DatetimeIndex(self.timestamp, name='timestamp')
+        )
+
+# Reverse index built once at import: primary trading pair -> coin id.
+# Hot paths get an O(1) lookup instead of a linear scan per fetch.
+_PRIMARY_TO_COIN: Final[Mapping[str, str]] = types.MappingProxyType(
+    {cfg.primary: coin_id for coin_id, cfg in CRYPTO_SYMBOLS.items()}
+)
+
+# Static region -> exchange priority table; built once instead of on every
+# initialization/status call, and frozen so nothing can reorder it at runtime
+_REGIONAL_EXCHANGES: Final[Mapping[str, Tuple[str, ...]]] = types.MappingProxyType({
+    'NA': ('kraken', 'kucoin'),  # North America optimized
+    'EU': ('kraken', 'kucoin'),  # Europe optimized
+    'ASIA': ('kucoin', 'kraken'),  # Asia optimized
+    'GLOBAL': ('kraken', 'kucoin')  # Global fallback
+})
+
+# Shared pooled keep-alive session for every outbound HTTP call in this
+# module (CoinGecko, geolocation probes, IP lookup); per-call connections
+# paid a fresh TCP+TLS handshake each time
+_http_session = requests.Session()
+_http_session.mount('https://', HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+))
+_coingecko_client = CoinGeckoAPI()
+_coingecko_client.session = _http_session
+# pycoingecko defaults to a 120s request timeout; a stalled call should
+# fail into the retry/fallback path long before that
+_coingecko_client.request_timeout = 10
+
+# The server's region doesn't move; keep the detected value for a day
+REGION_CACHE_TTL: Final = 86400
+
+# Market listings change rarely; refresh the on-disk copy daily
+MARKETS_CACHE_TTL: Final = 86400
+
+# Exponential backoff schedule shared by the fetch helpers and the manager
+_RETRY_DELAYS: Final = (1, 2, 4)
+
+# Smoothing factor for the per-exchange round-trip-time EWMA
+_RTT_EWMA_ALPHA: Final = 0.2
+
+# How often the background keep-alive pings each source to hold its
+# pooled connection open between user fetches
+_KEEPALIVE_INTERVAL: Final = 30.0
+
+# Circuit breaker: after this many consecutive fetch failures an
+# exchange is skipped entirely for the open window instead of burning
+# retry budget on every request
+_CIRCUIT_FAILURE_THRESHOLD: Final = 3
+_CIRCUIT_OPEN_SECONDS: Final = 60.0
+
+# Total wall-clock budget for the retry ladder inside one OHLCV fetch
+_FETCH_RETRY_BUDGET: Final = 3.0
+
+# Fetch sizes are rounded up to these buckets so nearby day counts share
+# one cached upstream fetch and get sliced locally
+_DAY_BUCKETS: Final = (7, 14, 30, 90, 180, 365)
+
+def _ohlcv_disk_ttl(timeframe: str) -> float:
+    """On-disk TTL for an OHLCV series, scaled to its candle size.
+
+    A 1m series goes stale in a minute; a daily series is good for an
+    hour. Keeping the persisted copy proportionally fresh lets warm
+    restarts skip the exchange round-trip without serving old candles.
+    """
+    if timeframe.endswith('m'):
+        return 60.0
+    if timeframe.endswith('h'):
+        return 300.0
+    return 3600.0
+
+def _bucket_days(days: int) -> int:
+    """Round a day count up to the nearest cache bucket."""
+    for bucket in _DAY_BUCKETS:
+        if bucket >= days:
+            return bucket
+    return days
+
+# Concurrency guards: the token buckets smooth request *rate*, these cap
+# how many fetches can be in flight at once so a burst of reruns can't
+# pile threads onto one exchange and trip its rate limiter
+_MAX_INFLIGHT_PER_EXCHANGE: Final = 4
+_MAX_INFLIGHT_TOTAL: Final = 8
+_global_inflight_sem = threading.BoundedSemaphore(_MAX_INFLIGHT_TOTAL)
+_exchange_sems: Dict[str, threading.BoundedSemaphore] = {}
+_exchange_sems_lock = threading.Lock()
+
+def _inflight_sem_for(exchange_id: str) -> threading.BoundedSemaphore:
+    """Per-exchange in-flight cap, created on first use."""
+    sem = _exchange_sems.get(exchange_id)
+    if sem is None:
+        with _exchange_sems_lock:
+            sem = _exchange_sems.setdefault(
+                exchange_id, threading.BoundedSemaphore(_MAX_INFLIGHT_PER_EXCHANGE)
+            )
+    return sem
+
+# Single-flight bookkeeping: concurrent identical fetches collapse to one
+class _Flight:
+    """Outcome of one in-flight fetch, shared between leader and followers."""
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+_inflight_lock = threading.Lock()
+_inflight: Dict[tuple, _Flight] = {}
+
+def _single_flight(key: tuple, fetch):
+    """Run fetch once per key; concurrent callers share the first outcome.
+
+    A failing leader re-raises its exception in every follower instead
+    of handing them None, so callers (and the Streamlit caches above
+    them) never treat a failed fetch as a valid result. Flights are
+    dropped from the registry before their event fires, so a later call
+    starts a fresh fetch rather than reading a stale result.
+    """
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        is_leader = flight is None
+        if is_leader:
+            flight = _Flight()
+            _inflight[key] = flight
+
+    if not is_leader:
+        flight.event.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    try:
+        flight.value = fetch()
+        return flight.value
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        flight.event.set()
+
+def _region_cache_key() -> str:
+    """Cache key for the detected region, scoped to the public IP.
+
+    Keying by IP keeps the 24-hour TTL honest when the host changes
+    networks; if the IP lookup fails the key degrades to the shared
+    default and behaviour matches the unkeyed cache.
+    """
+    try:
+        response = _http_session.get('https://api.ipify.org', timeout=2)
+        if response.status_code == 200:
+            return f'detected_region:{response.text.strip()}'
+    except Exception as e:
+        logger.warning("Error fetching public IP: %s", e)
+    return 'detected_region'
 
 def detect_region() -> str:
     """Enhanced region detection with better error handling."""
@@ -46,44 +266,75 @@ def detect_region() -> str:
         if 'detected_region' in st.session_state:
             return st.session_state.detected_region
 
+        # New sessions reuse the on-disk result instead of re-probing
+        cache_key = _region_cache_key()
+        cached_region = disk_cache.get(cache_key, REGION_CACHE_TTL)
+        if cached_region:
+            st.session_state.detected_region = cached_region
+            return cached_region
+
         services = [
             'https://ipapi.co/json/',
             'https://ip-api.com/json/',
             'https://ipwhois.app/json/'
         ]
-        
-        for service in services:
-            try:
-                response = requests.get(service, timeout=5)
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    region = (
-                        data.get('country_code') or 
-                        data.get('countryCode') or 
-                        'GLOBAL'
-                    )
-                    
-                    detected_region = 'GLOBAL'
-                    if region in ['US', 'CA']:
-                        detected_region = 'NA'
-                    elif region in ['GB', 'DE', 'FR', 'IT', 'ES']:
-                        detected_region = 'EU'
-                    elif region in ['JP', 'KR', 'CN', 'HK', 'SG']:
-                        detected_region = 'ASIA'
-                    
-                    st.session_state.detected_region = detected_region
-                    logger.info(f"Detected region: {detected_region}")
-                    return detected_region
-                    
-            except Exception as e:
-                logger.warning(f"Error with geolocation service {service}: {str(e)}")
-                continue
-                
-        # Default to GLOBAL if all services fail
-        logger.warning("Unable to detect region, defaulting to GLOBAL")
-        return 'GLOBAL'
-        
+
+        def _probe_one(service: str) -> str:
+            response = _http_session.get(service, timeout=2)
+            if response.status_code != 200:
+                raise ValueError(f"status {response.status_code}")
+            data = response.json()
+
+            region = (
+                data.get('country_code') or
+                data.get('countryCode') or
+                'GLOBAL'
+            )
+
+            if region in ['US', 'CA']:
+                return 'NA'
+            if region in ['GB', 'DE', 'FR', 'IT', 'ES']:
+                return 'EU'
+            if region in ['JP', 'KR', 'CN', 'HK', 'SG']:
+                return 'ASIA'
+            return 'GLOBAL'
+
+        def _probe_services() -> str:
+            # Probe every service at once; the first answer wins, so the
+            # worst case is one timeout rather than one per service
+            with ThreadPoolExecutor(max_workers=len(services)) as executor:
+                futures = {executor.submit(_probe_one, s): s for s in services}
+                try:
+                    # Overall budget on top of the 2s per-probe timeout so a
+                    # stalled connect can't hold up the whole detection
+                    for future in as_completed(futures, timeout=5):
+                        try:
+                            detected_region = future.result()
+                        except Exception as e:
+                            logger.warning(
+                                f"Error with geolocation service {futures[future]}: {str(e)}"
+                            )
+                            continue
+                        for other in futures:
+                            if other is not future:
+                                other.cancel()
+                        disk_cache.set(cache_key, detected_region)
+                        logger.info(f"Detected region: {detected_region}")
+                        return detected_region
+                except FuturesTimeoutError:
+                    # Not the builtin TimeoutError on Python 3.10; catching
+                    # the futures alias works on 3.10 and 3.11 alike
+                    logger.warning("Geolocation probes timed out")
+
+            # Default to GLOBAL if all services fail
+            logger.warning("Unable to detect region, defaulting to GLOBAL")
+            return 'GLOBAL'
+
+        # Concurrent first calls (multiple tabs, fast reruns) share one probe
+        detected_region = _single_flight(('detect_region',), _probe_services)
+        st.session_state.detected_region = detected_region
+        return detected_region
+
     except Exception as e:
         logger.error(f"Error in region detection: {str(e)}")
         return 'GLOBAL'
@@ -98,7 +349,18 @@ class ExchangeManager:
         self.websocket_enabled = False
         self.websocket_callbacks = {}
         self.active_exchange = None
+        # One long-lived pool for all fetch fan-out; building an executor
+        # per call paid thread spawn/teardown on every request
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='exchange-fetch')
         self._initialize_exchange()
+        # Keep the pooled connections warm in the background: a dropped
+        # idle TLS connection costs the next real fetch a full handshake
+        self._keepalive_stop = threading.Event()
+        threading.Thread(
+            target=self._keepalive_loop,
+            name='exchange-keepalive',
+            daemon=True
+        ).start()
 
     @property
     def current_exchange(self) -> Optional[str]:
@@ -113,51 +375,86 @@ class ExchangeManager:
         """Async context manager exit with proper cleanup."""
         await self.cleanup()
 
+    def _connect_exchange(self, exchange_id: str,
+                          api_key: Optional[str],
+                          api_secret: Optional[str]) -> ccxt.Exchange:
+        """Build and connect a single exchange, falling back to public API."""
+        exchange_class = getattr(ccxt, exchange_id)
+
+        # Configure exchange with or without authentication; the OHLCV
+        # limit-argument warning is per-call overhead with no signal here
+        exchange_config = {
+            'enableRateLimit': True,
+            'timeout': 30000,
+            'options': {'warnOnFetchOHLCVLimitArgument': False}
+        }
+
+        # Add API keys if available
+        authenticated = bool(api_key and api_secret and exchange_id == 'kraken')
+        if authenticated:
+            exchange_config.update({
+                'apiKey': api_key,
+                'secret': api_secret
+            })
+            logger.info(f"Initializing {exchange_id} with API key authentication")
+        else:
+            logger.info(f"Initializing {exchange_id} with public API endpoints only")
+
+        try:
+            exchange = exchange_class(exchange_config)
+            self._load_markets_cached(exchange)
+            return exchange
+        except ccxt.AuthenticationError:
+            if not authenticated:
+                raise
+            # Try to fallback to public API
+            logger.warning(f"Authentication failed for {exchange_id}, retrying with public API")
+            exchange = exchange_class({
+                'enableRateLimit': True,
+                'timeout': 30000,
+                'options': {'warnOnFetchOHLCVLimitArgument': False}
+            })
+            self._load_markets_cached(exchange)
+            logger.info(f"Fallback to public API successful for {exchange_id}")
+            return exchange
+
+    def _load_markets_cached(self, exchange: ccxt.Exchange) -> None:
+        """Seed markets from the disk cache when fresh, else download and store.
+
+        Warm process starts skip the multi-hundred-KB load_markets()
+        download per exchange entirely.
+        """
+        cached_markets = disk_cache.get(f'markets:{exchange.id}', MARKETS_CACHE_TTL)
+        if cached_markets:
+            exchange.set_markets(cached_markets)
+            return
+        exchange.load_markets()
+        disk_cache.set(f'markets:{exchange.id}', exchange.markets)
+
     def _initialize_exchange(self):
-        """Initialize exchange with fallback options."""
+        """Initialize all regional exchanges concurrently with fallback options.
+
+        Connections run in parallel so startup cost is the slowest single
+        exchange, not the sum of every load_markets round-trip.
+        """
         exchange_errors = []
-        
+
         # Get API keys from environment variables
         api_key = os.getenv("KRAKEN_API_KEY")
         api_secret = os.getenv("KRAKEN_SECRET")
-        
-        for exchange_id in self._get_region_optimized_exchanges():
+
+        exchange_ids = self._get_region_optimized_exchanges()
+        futures = {
+            exchange_id: self._pool.submit(
+                self._connect_exchange, exchange_id, api_key, api_secret
+            )
+            for exchange_id in exchange_ids
+        }
+
+        # Harvest in regional priority order so the preferred exchange wins
+        for exchange_id in exchange_ids:
             try:
-                exchange_class = getattr(ccxt, exchange_id)
-                
-                # Configure exchange with or without authentication
-                exchange_config = {
-                    'enableRateLimit': True,
-                    'timeout': 30000
-                }
-                
-                # Add API keys if available
-                if api_key and api_secret and exchange_id == 'kraken':
-                    exchange_config.update({
-                        'apiKey': api_key,
-                        'secret': api_secret
-                    })
-                    logger.info(f"Initializing {exchange_id} with API key authentication")
-                else:
-                    logger.info(f"Initializing {exchange_id} with public API endpoints only")
-                
-                exchange = exchange_class(exchange_config)
-                
-                # Test API access
-                exchange.load_markets()
-                self.active_exchange = exchange
-                self.exchanges[exchange_id] = exchange
-                
-                # Update connection status with authentication level
-                self.connection_status[exchange_id] = {
-                    'status': 'available',
-                    'auth_level': 'authenticated' if api_key and api_secret else 'public',
-                    'last_checked': datetime.now()
-                }
-                
-                logger.info(f"Successfully connected to {exchange_id}")
-                break
-                
+                exchange = futures[exchange_id].result()
             except ccxt.AuthenticationError as e:
                 error_msg = (
                     f"Authentication failed for {exchange_id}. "
@@ -166,34 +463,37 @@ class ExchangeManager:
                 )
                 exchange_errors.append(error_msg)
                 logger.warning(error_msg)
-                
-                # Try to fallback to public API
-                try:
-                    exchange = exchange_class({
-                        'enableRateLimit': True,
-                        'timeout': 30000
-                    })
-                    exchange.load_markets()
-                    self.active_exchange = exchange
-                    self.exchanges[exchange_id] = exchange
-                    logger.info(f"Fallback to public API successful for {exchange_id}")
-                    break
-                except Exception as e:
-                    logger.warning(f"Public API fallback failed for {exchange_id}: {str(e)}")
-                    
+                continue
             except ccxt.ExchangeNotAvailable as e:
                 error_msg = f"{exchange_id} is not available: {str(e)}"
                 exchange_errors.append(error_msg)
                 logger.warning(error_msg)
+                continue
             except ccxt.ExchangeError as e:
                 error_msg = f"Error connecting to {exchange_id}: {str(e)}"
                 exchange_errors.append(error_msg)
                 logger.warning(error_msg)
+                continue
             except Exception as e:
                 error_msg = f"Unexpected error with {exchange_id}: {str(e)}"
                 exchange_errors.append(error_msg)
                 logger.error(error_msg)
-        
+                continue
+
+            self.exchanges[exchange_id] = exchange
+
+            # Update connection status with authentication level
+            self.connection_status[exchange_id] = {
+                'status': 'available',
+                'auth_level': 'authenticated' if api_key and api_secret and exchange_id == 'kraken' else 'public',
+                'last_checked': datetime.now(),
+                'last_checked_monotonic': time.monotonic()
+            }
+
+            if self.active_exchange is None:
+                self.active_exchange = exchange
+            logger.info(f"Successfully connected to {exchange_id}")
+
         if not self.active_exchange:
             error_message = (
                 "Unable to connect to any cryptocurrency exchange. "
@@ -287,6 +587,8 @@ class ExchangeManager:
                 await websocket_manager.disconnect_all()
                 self.websocket_enabled = False
                 self.websocket_callbacks.clear()
+            self._keepalive_stop.set()
+            self._pool.shutdown(wait=False)
         except Exception as e:
             logger.error(f"Error during cleanup: {str(e)}")
 
@@ -299,40 +601,164 @@ class ExchangeManager:
             )
         return ConnectionState.DISCONNECTED
 
-    def _get_region_optimized_exchanges(self) -> List[str]:
-        """Get region-optimized list of exchanges."""
-        regional_exchanges = {
-            'NA': ['kraken', 'kucoin'],  # North America optimized
-            'EU': ['kraken', 'kucoin'],  # Europe optimized
-            'ASIA': ['kucoin', 'kraken'],  # Asia optimized
-            'GLOBAL': ['kraken', 'kucoin']  # Global fallback
-        }
-        return regional_exchanges.get(self.region, regional_exchanges['GLOBAL'])
+    def _keepalive_loop(self) -> None:
+        """Ping every connected source periodically so sockets stay open.
+
+        fetch_time() and CoinGecko's /ping are the smallest payloads the
+        respective APIs offer; failures only mean the next real request
+        pays the handshake again, so they are logged at debug and
+        otherwise ignored.
+        """
+        while not self._keepalive_stop.wait(_KEEPALIVE_INTERVAL):
+            for exchange in list(self.exchanges.values()):
+                try:
+                    exchange.fetch_time()
+                except Exception as e:
+                    logger.debug("Keep-alive ping failed for %s: %s", exchange.id, e)
+            for name, source in list(self.fallback_sources):
+                if name == 'coingecko':
+                    try:
+                        source.ping()
+                    except Exception as e:
+                        logger.debug("Keep-alive ping failed for coingecko: %s", e)
+
+    def refresh_exchange_status(self) -> None:
+        """Probe all connected exchanges concurrently and update their status.
+
+        Each probe times its own fetch_time round-trip, so response_time
+        is per exchange rather than cumulative wall-clock.
+        """
+        def _probe(exchange_id: str, exchange: ccxt.Exchange) -> Tuple[str, Dict[str, Any]]:
+            start = time.perf_counter()
+            try:
+                exchange.fetch_time()
+                return exchange_id, {
+                    'status': 'available',
+                    'response_time': time.perf_counter() - start,
+                    'last_checked': datetime.now(),
+                    'last_checked_monotonic': time.monotonic()
+                }
+            except Exception as e:
+                return exchange_id, {
+                    'status': 'unavailable',
+                    'error': str(e),
+                    'last_checked': datetime.now(),
+                    'last_checked_monotonic': time.monotonic()
+                }
+
+        if not self.exchanges:
+            return
+
+        results = list(self._pool.map(lambda item: _probe(*item), self.exchanges.items()))
+
+        for exchange_id, status in results:
+            entry = self.connection_status.setdefault(exchange_id, {})
+            rtt = status.get('response_time')
+            if rtt is not None:
+                prev = entry.get('rtt_ewma')
+                status['rtt_ewma'] = (
+                    rtt if prev is None
+                    else _RTT_EWMA_ALPHA * rtt + (1 - _RTT_EWMA_ALPHA) * prev
+                )
+            entry.update(status)
+
+    def refresh_exchange_status_if_stale(self, max_age: float = 300.0) -> None:
+        """Re-probe the exchanges when any status entry is older than max_age.
+
+        Freshness is judged on the monotonic clock: cheaper than datetime
+        subtraction and immune to wall-clock jumps. datetime stays in the
+        entries for human-readable display only.
+        """
+        now = time.monotonic()
+        if any(
+            now - status.get('last_checked_monotonic', 0.0) > max_age
+            for status in self.connection_status.values()
+        ):
+            self.refresh_exchange_status()
+
+    def _record_fetch_result(self, exchange_id: str, ok: bool) -> None:
+        """Track consecutive failures; repeated ones open the circuit."""
+        entry = self.connection_status.setdefault(exchange_id, {})
+        if ok:
+            entry['failures'] = 0
+            entry.pop('circuit_open_until', None)
+            return
+        failures = entry.get('failures', 0) + 1
+        entry['failures'] = failures
+        if failures > _CIRCUIT_FAILURE_THRESHOLD:
+            entry['circuit_open_until'] = time.monotonic() + _CIRCUIT_OPEN_SECONDS
+            logger.warning(
+                "Circuit opened for %s after %d consecutive failures",
+                exchange_id, failures
+            )
+
+    def _circuit_open(self, exchange_id: str) -> bool:
+        """True while an exchange is in its cool-off window."""
+        until = self.connection_status.get(exchange_id, {}).get('circuit_open_until')
+        return until is not None and time.monotonic() < until
+
+    def _get_region_optimized_exchanges(self) -> Tuple[str, ...]:
+        """Get region-optimized priority ordering of exchanges."""
+        return _REGIONAL_EXCHANGES.get(self.region, _REGIONAL_EXCHANGES['GLOBAL'])
+
+    def _exchanges_by_latency(self) -> List[str]:
+        """Connected exchanges ordered by their measured round-trip EWMA.
+
+        Exchanges without a measurement yet sort last but keep their
+        relative regional priority (the sort is stable), so a statically
+        preferred exchange that turns out slow stops heading the list.
+        """
+        regional = [
+            exchange_id for exchange_id in self._get_region_optimized_exchanges()
+            if exchange_id in self.exchanges
+        ]
+        return sorted(
+            regional,
+            key=lambda ex: self.connection_status.get(ex, {}).get('rtt_ewma', float('inf'))
+        )
 
     def _test_exchange_connection(self, exchange: ccxt.Exchange, exchange_id: str):
-        """Test exchange connection with retry mechanism."""
+        """Test exchange connection with retry mechanism.
+
+        Uses fetch_time() as the liveness probe: it is a tiny payload
+        compared to load_markets(), which ccxt fetches lazily on the
+        first real data request anyway. Retries back off with
+        decorrelated jitter under a hard 5-second budget, so a flaky
+        exchange can't hold initialization for the full 1+2+4s ladder
+        and concurrent connectors don't retry in lockstep.
+        """
         last_error = None
-        
-        for delay in self.retry_delays:
+        deadline = time.monotonic() + 5.0
+        sleep = 0.3
+
+        while True:
             try:
-                exchange.load_markets()
+                start = time.perf_counter()
+                exchange.fetch_time()
+                response_time = time.perf_counter() - start
                 self.exchanges[exchange_id] = exchange
                 self.connection_status[exchange_id] = {
                     'status': 'available',
                     'last_checked': datetime.now(),
+                    'last_checked_monotonic': time.monotonic(),
                     'features': self._get_exchange_features(exchange),
                     'reliability': 0.95,
-                    'response_time': 0.5,
+                    'response_time': response_time,
+                    'rtt_ewma': response_time,
                     'regions': ['GLOBAL', self.region]
                 }
                 logger.info(f"Successfully initialized {exchange_id}")
                 return
-            except ccxt.RequestTimeout:
-                last_error = f"Timeout connecting to {exchange_id}"
-                time.sleep(delay)
+            except (ccxt.RequestTimeout, ccxt.NetworkError) as e:
+                last_error = f"Network error connecting to {exchange_id}: {str(e)}"
             except Exception as e:
                 last_error = str(e)
                 break
+
+            sleep = min(2.0, random.uniform(0.3, sleep * 3))
+            if time.monotonic() + sleep > deadline:
+                break
+            time.sleep(sleep)
                 
         if last_error:
             raise Exception(last_error)
@@ -361,10 +787,11 @@ class ExchangeManager:
         self.connection_status[exchange_id] = {
             'status': status,
             'last_checked': datetime.now(),
+            'last_checked_monotonic': time.monotonic(),
             'error': error_msg,
             'regions': []
         }
-        logger.warning(f"Error initializing {exchange_id}: {error_msg}")
+        logger.warning("Error initializing %s: %s", exchange_id, error_msg)
 
     def _initialize_fallback_sources(self):
         """Initialize fallback data sources with enhanced retry mechanism."""
@@ -372,7 +799,7 @@ class ExchangeManager:
         
         for attempt in range(MAX_RETRIES):
             try:
-                cg = CoinGeckoAPI()
+                cg = _coingecko_client
                 # Test connection
                 cg.ping()
                 self.fallback_sources.append(('coingecko', cg))
@@ -387,42 +814,80 @@ class ExchangeManager:
                     logger.error("All attempts to initialize CoinGecko failed")
 
     def get_market_data(self, symbol: str, timeframe: str = '1d', limit: int = 30) -> Tuple[Optional[pd.DataFrame], str]:
-        """Get market data with enhanced fallback mechanism and regional optimization."""
+        """Get market data with enhanced fallback mechanism and regional optimization.
+
+        Concurrent identical calls collapse into one underlying fetch, so
+        several widgets viewing the same asset cost a single request.
+        """
+        return _single_flight(
+            ('market_data', symbol, timeframe, limit),
+            lambda: self._get_market_data_uncoalesced(symbol, timeframe, limit)
+        )
+
+    def _get_market_data_uncoalesced(self, symbol: str, timeframe: str, limit: int) -> Tuple[Optional[pd.DataFrame], str]:
+        """Fetch market data for one symbol, fanning out across sources.
+
+        All candidate (exchange, symbol) pairs are fetched concurrently and
+        the first valid OHLCV response wins, so a slow or failing exchange
+        no longer adds its full round-trip before the next one is tried.
+        """
         errors = []
-        
-        # Try primary exchange for the region
-        regional_exchanges = self._get_region_optimized_exchanges()
-        for exchange_id in regional_exchanges:
-            if exchange_id in self.exchanges:
+
+        # Primary symbol on the exchanges in live-latency order, then
+        # regional alternatives; exchanges in their circuit-breaker
+        # cool-off are skipped without an attempt
+        candidates: List[Tuple[str, str]] = []
+        for exchange_id in self._exchanges_by_latency():
+            if not self._circuit_open(exchange_id):
+                candidates.append((exchange_id, symbol))
+
+        coin_id = _PRIMARY_TO_COIN.get(symbol)
+        if coin_id:
+            config = CRYPTO_SYMBOLS[coin_id]
+            regional_pairs = config.regional_pairs.get(self.region, config.alternatives)
+            seen = set(candidates)
+            for alt_symbol in regional_pairs:
+                for exchange_id in self.exchanges:
+                    if self._circuit_open(exchange_id):
+                        continue
+                    if (exchange_id, alt_symbol) not in seen:
+                        seen.add((exchange_id, alt_symbol))
+                        candidates.append((exchange_id, alt_symbol))
+
+        if candidates:
+            futures = {
+                self._pool.submit(
+                    self._fetch_market_data,
+                    self.exchanges[exchange_id], fetch_symbol, timeframe, limit
+                ): (exchange_id, fetch_symbol)
+                for exchange_id, fetch_symbol in candidates
+            }
+            for future in as_completed(futures):
+                exchange_id, fetch_symbol = futures[future]
                 try:
-                    data = self._fetch_market_data(self.exchanges[exchange_id], symbol, timeframe, limit)
-                    if isinstance(data, pd.DataFrame) and not data.empty:
-                        return data, exchange_id
+                    data = future.result()
                 except Exception as e:
-                    errors.append(f"{exchange_id}: {str(e)}")
-        
-        # Try alternative symbols based on region
-        coin_id = next((k for k, v in CRYPTO_SYMBOLS.items() if v['primary'] == symbol), None)
-        if coin_id and coin_id in CRYPTO_SYMBOLS:
-            regional_pairs = CRYPTO_SYMBOLS[coin_id]['regional_pairs'].get(self.region, CRYPTO_SYMBOLS[coin_id]['alternatives'])
-            
-            for alt_symbol in regional_pairs:
-                for exchange_id, exchange in self.exchanges.items():
-                    try:
-                        data = self._fetch_market_data(exchange, alt_symbol, timeframe, limit)
-                        if isinstance(data, pd.DataFrame) and not data.empty:
-                            return data, exchange_id
-                    except Exception as e:
-                        errors.append(f"{exchange_id} ({alt_symbol}): {str(e)}")
+                    self._record_fetch_result(exchange_id, False)
+                    errors.append(f"{exchange_id} ({fetch_symbol}): {str(e)}")
+                    continue
+                if isinstance(data, pd.DataFrame) and not data.empty:
+                    self._record_fetch_result(exchange_id, True)
+                    # First valid result wins; drop whatever is still queued
+                    for other in futures:
+                        if other is not future:
+                            other.cancel()
+                    return data, exchange_id
+                self._record_fetch_result(exchange_id, False)
 
-        # Try fallback sources
-        for source_name, source in self.fallback_sources:
+        # Try the CoinGecko fallback once; looping the sources repeated the
+        # identical request per entry
+        if self.fallback_sources:
             try:
                 data = self._fetch_coingecko_data(symbol, limit)
                 if isinstance(data, pd.DataFrame) and not data.empty:
                     return data, 'coingecko'
             except Exception as e:
-                errors.append(f"{source_name}: {str(e)}")
+                errors.append(f"coingecko: {str(e)}")
 
         error_msg = "Failed to fetch market data. Errors: " + "; ".join(errors)
         logger.error(error_msg)
@@ -430,35 +895,14 @@ class ExchangeManager:
 
     def _fetch_market_data(self, exchange: ccxt.Exchange, symbol: str, timeframe: str, limit: int) -> Optional[pd.DataFrame]:
         """Fetch market data with timeout and retry mechanism."""
-        for delay in self.retry_delays:
-            try:
-                data = exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-                if not data:
-                    continue
-                    
-                df = pd.DataFrame(
-                    data,
-                    columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-                )
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                df.set_index('timestamp', inplace=True)
-                return df
-                
-            except ccxt.RequestTimeout:
-                time.sleep(delay)
-                continue
-            except Exception as e:
-                logger.warning(f"Error fetching data from {exchange.id}: {str(e)}")
-                break
-                
-        return None
+        return _fetch_ohlcv_cached(exchange.id, symbol, timeframe, limit, _exchange=exchange)
 
     def _fetch_coingecko_data(self, symbol: str, days: int) -> Optional[pd.DataFrame]:
         """Fetch data from CoinGecko with enhanced error handling."""
         try:
-            coin_id = next((k for k, v in CRYPTO_SYMBOLS.items() if v['primary'] == symbol), None)
+            coin_id = _PRIMARY_TO_COIN.get(symbol)
             if not coin_id:
-                logger.warning(f"No CoinGecko ID found for symbol {symbol}")
+                logger.warning("No CoinGecko ID found for symbol %s", symbol)
                 return None
 
             source = next((s[1] for s in self.fallback_sources if s[0] == 'coingecko'), None)
@@ -466,64 +910,261 @@ class ExchangeManager:
                 logger.warning("CoinGecko source not initialized")
                 return None
 
-            for delay in self.retry_delays:
-                try:
-                    data = source.get_coin_market_chart_by_id(
-                        id=CRYPTO_SYMBOLS[coin_id]['coingecko_id'],
-                        vs_currency='usd',
-                        days=days
-                    )
-                    
-                    if not data or 'prices' not in data:
-                        time.sleep(delay)
-                        continue
-
-                    df = pd.DataFrame(data['prices'], columns=['timestamp', 'price'])
-                    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                    df.set_index('timestamp', inplace=True)
-                    
-                    if 'total_volumes' in data:
-                        df['volume'] = [v[1] for v in data['total_volumes']]
-                    
-                    return df
-                    
-                except Exception:
-                    if delay == self.retry_delays[-1]:  # Last retry
-                        raise
-                    time.sleep(delay)
-                    continue
+            return _fetch_coingecko_cached(
+                CRYPTO_SYMBOLS[coin_id].coingecko_id, days, _source=source
+            )
 
         except Exception as e:
-            logger.error(f"Error fetching data from CoinGecko: {str(e)}")
+            logger.error("Error fetching data from CoinGecko: %s", e)
             return None
 
-# Export singleton instance
-exchange_manager = ExchangeManager()
+@st.cache_data(ttl=60, max_entries=256)
+def _fetch_ohlcv_cached(exchange_id: str, symbol: str, timeframe: str,
+                        limit: int, _exchange: ccxt.Exchange) -> Optional[pd.DataFrame]:
+    """Fetch OHLCV with retries; Streamlit reruns within the TTL hit the cache.
+
+    The exchange object carries a leading underscore so the cache is
+    keyed on (exchange_id, symbol, timeframe, limit) only. A second,
+    disk-backed layer with a candle-size TTL survives process restarts,
+    turning a warm restart into a local read instead of an API call.
+    """
+    disk_key = f'ohlcv:{exchange_id}:{symbol}:{timeframe}:{limit}'
+    disk_ttl = _ohlcv_disk_ttl(timeframe)
+    cached = disk_cache.get(disk_key, disk_ttl)
+    if cached is not None:
+        return cached
+
+    # When the in-flight caps are saturated a burst is already in
+    # progress; fail fast into the caller's fallback path instead of
+    # queueing behind it, keeping the UI responsive
+    exchange_sem = _inflight_sem_for(exchange_id)
+    if not exchange_sem.acquire(timeout=2.0):
+        logger.warning("Too many in-flight requests for %s; deferring to fallback", exchange_id)
+        return None
+    if not _global_inflight_sem.acquire(timeout=2.0):
+        exchange_sem.release()
+        logger.warning("Global in-flight fetch cap reached; deferring to fallback")
+        return None
+
+    try:
+        # A hard budget caps the whole retry ladder: a stuck exchange
+        # gives up after ~3s instead of sleeping out the full schedule,
+        # and the jitter keeps parallel workers from retrying in step
+        deadline = time.monotonic() + _FETCH_RETRY_BUDGET
+        for delay in _RETRY_DELAYS:
+            try:
+                # Shared per-host gate: concurrent worker threads can't burst
+                # past the exchange's rate limit together
+                bucket_for(exchange_id).acquire()
+                data = _exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+                if not data:
+                    continue
+
+                # One typed SoA pass instead of per-row object inference
+                df = OHLCV.from_ccxt(data).to_dataframe()
+                disk_cache.set(disk_key, df)
+                return df
+
+            except ccxt.RequestTimeout:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(delay * random.uniform(0.5, 1.5), remaining))
+                continue
+            except Exception as e:
+                logger.warning("Error fetching data from %s: %s", exchange_id, e)
+                break
+    finally:
+        _global_inflight_sem.release()
+        exchange_sem.release()
 
+    return None
+
+@st.cache_data(ttl=60, max_entries=256)
+def _fetch_coingecko_cached(coingecko_id: str, days: int,
+                            _source: CoinGeckoAPI) -> Optional[pd.DataFrame]:
+    """Fetch a CoinGecko market chart with retries, cached per (id, days).
+
+    Mirrors the OHLCV helper's disk layer: short spans carry hourly
+    points and expire quickly, longer spans are daily and keep for an
+    hour.
+    """
+    disk_key = f'coingecko:{coingecko_id}:{days}'
+    disk_ttl = 300.0 if days <= 7 else 3600.0
+    cached = disk_cache.get(disk_key, disk_ttl)
+    if cached is not None:
+        return cached
+
+    for delay in _RETRY_DELAYS:
+        try:
+            bucket_for('coingecko').acquire()
+            data = _source.get_coin_market_chart_by_id(
+                id=coingecko_id,
+                vs_currency='usd',
+                days=days
+            )
+
+            if not data or 'prices' not in data:
+                time.sleep(delay)
+                continue
+
+            # Vectorized conversion of the [timestamp, value] pair lists;
+            # float32 columns match what the exchange OHLCV path returns
+            prices = np.asarray(data['prices'], dtype=np.float64)
+            columns = {'price': prices[:, 1].astype(np.float32)}
+            if 'total_volumes' in data:
+                columns['volume'] = np.asarray(
+                    data['total_volumes'], dtype=np.float64
+                )[:, 1].astype(np.float32)
+
+            # One construction with all columns; inserting volume
+            # afterwards would re-consolidate the blocks
+            df = pd.DataFrame(
+                columns,
+                index=pd.to_datetime(prices[:, 0].astype('int64'), unit='ms')
+            )
+            df.index.name = 'timestamp'
+            disk_cache.set(disk_key, df)
+            return df
+
+        except Exception:
+            if delay == _RETRY_DELAYS[-1]:  # Last retry
+                raise
+            time.sleep(delay)
+            continue
+
+    return None
+
+@st.cache_resource
+def get_exchange_manager() -> "ExchangeManager":
+    """Create the shared ExchangeManager on first use.
+
+    Constructing it at import time blocked every import of this module
+    on region detection and exchange connection; st.cache_resource keeps
+    a single instance per process, shared across reruns and sessions.
+    """
+    return ExchangeManager()
+
+@st.cache_data(ttl=300, show_spinner=False)
 def get_crypto_data(coin_id: str, days: str = '30') -> pd.DataFrame:
-    """Fetch cryptocurrency data with enhanced fallback mechanism."""
+    """Fetch cryptocurrency data with enhanced fallback mechanism.
+
+    Memoized per (coin_id, days) across reruns and sessions for five
+    minutes, so widget interactions don't re-trigger the exchange
+    dispatch at all. Identical concurrent requests racing before the
+    cache is warm still collapse into a single upstream fetch.
+    """
     try:
         symbols = CRYPTO_SYMBOLS.get(coin_id.lower())
         if not symbols:
             raise ValueError(f"Unsupported cryptocurrency: {coin_id}")
 
-        data, source = exchange_manager.get_market_data(
-            symbols['primary'],
-            timeframe='1d' if int(days) > 7 else '1h',
-            limit=int(days) * (24 if int(days) <= 7 else 1)
+        # Fetch the whole bucket so a 25-day request reuses the cached
+        # 30-day payload; the tail slice restores the exact span asked for
+        days_i = int(days)
+        bucket = _bucket_days(days_i)
+        per_day = 24 if days_i <= 7 else 1
+        rows_wanted = days_i * per_day
+
+        data, source = _single_flight(
+            ('get_crypto_data', coin_id.lower(), bucket, per_day),
+            lambda: get_exchange_manager().get_market_data(
+                symbols.primary,
+                timeframe='1d' if days_i > 7 else '1h',
+                limit=bucket * per_day
+            )
         )
 
         if isinstance(data, pd.DataFrame) and not data.empty:
             st.session_state.data_source = source
-            return data
+            return data.tail(rows_wanted) if len(data) > rows_wanted else data
 
-        logger.warning(f"No data available from {source}, trying fallback sources...")
+        logger.warning("No data available from %s, trying fallback sources...", source)
         return pd.DataFrame()
 
     except Exception as e:
-        logger.error(f"Error fetching crypto data: {str(e)}")
+        logger.error("Error fetching crypto data: %s", e)
         return pd.DataFrame()
 
-def get_exchange_status() -> Dict[str, Dict[str, Any]]:
-    """Get detailed status of all exchanges."""
-    return exchange_manager.connection_status
\ No newline at end of file
+def get_crypto_data_many(coin_ids: List[str], days: str = '30') -> Dict[str, pd.DataFrame]:
+    """Fetch several coins concurrently instead of one serialized loop.
+
+    Multi-asset dashboard views pay roughly one wall-clock round-trip
+    for the whole batch. A dedicated short-lived pool is used here — the
+    per-coin fetches fan out on the manager's own pool, and nesting both
+    on the same executor could starve it.
+    """
+    frames: Dict[str, pd.DataFrame] = {}
+    if not coin_ids:
+        return frames
+
+    with ThreadPoolExecutor(max_workers=min(len(coin_ids), 4)) as executor:
+        futures = {
+            coin_id: executor.submit(get_crypto_data, coin_id, days)
+            for coin_id in coin_ids
+        }
+        for coin_id, future in futures.items():
+            try:
+                frames[coin_id] = future.result()
+            except Exception as e:
+                logger.warning("Error fetching %s: %s", coin_id, e)
+                frames[coin_id] = pd.DataFrame()
+    return frames
+
+@st.cache_data(ttl=60)
+def get_current_metrics(coin_ids: List[str]) -> Dict[str, Dict[str, float]]:
+    """Current price, volume and market cap for several coins in one call.
+
+    CoinGecko's /coins/markets endpoint returns every requested id at
+    once, so status-card style refreshes cost a single HTTP request
+    instead of one market-chart call per coin. History still goes
+    through get_crypto_data; only the per-coin chart endpoint exists
+    for that.
+    """
+    if not coin_ids:
+        return {}
+    try:
+        bucket_for('coingecko').acquire()
+        rows = _coingecko_client.get_coins_markets(
+            vs_currency='usd',
+            ids=','.join(coin_ids),
+            per_page=len(coin_ids),
+            sparkline=False
+        )
+        return {
+            row['id']: {
+                'price': float(row.get('current_price') or 0.0),
+                'volume': float(row.get('total_volume') or 0.0),
+                'market_cap': float(row.get('market_cap') or 0.0),
+                'change_24h': float(row.get('price_change_percentage_24h') or 0.0)
+            }
+            for row in rows or []
+        }
+    except Exception as e:
+        logger.error("Error fetching batch market metrics: %s", e)
+        return {}
+
+def get_bitcoin_dominance(days: str = '30') -> pd.DataFrame:
+    """Bitcoin dominance series; delegates to the canonical implementation.
+
+    The top-level data_fetcher module owns the single dominance
+    implementation; the import is deferred so merely importing this
+    module doesn't pay its exchange setup cost.
+    """
+    from data_fetcher import get_bitcoin_dominance as _get_bitcoin_dominance
+    return _get_bitcoin_dominance(days)
+
+def get_exchange_status() -> Mapping[str, Mapping[str, Any]]:
+    """Read-only view of all exchange statuses, refreshing stale entries.
+
+    The proxies wrap the live status dicts without copying them, so the
+    status widget sees current data each rerun but can no longer mutate
+    the manager's bookkeeping (failure counters, circuit state, RTT
+    EWMA) by accident.
+    """
+    manager = get_exchange_manager()
+    manager.refresh_exchange_status_if_stale()
+    return types.MappingProxyType({
+        exchange_id: types.MappingProxyType(status)
+        for exchange_id, status in manager.connection_status.items()
+    })
\ No newline at end of file
@@ -3,6 +3,19 @@ import numpy as np
 from typing import Dict, Tuple, List
 from utils.technical_analysis import calculate_rsi, calculate_macd
 
+# Threshold tables for get_risk_level: points[i] applies when the metric
+# exceeds thresholds[i-1]. searchsorted with the default 'left' side
+# reproduces the original strict `>` comparisons exactly, and tuning a
+# threshold becomes a data change instead of a code change.
+_RSI_HIGH_THRESHOLDS = np.array([70.0, 80.0])
+_RSI_HIGH_POINTS = np.array([0, 2, 3])
+_VOLATILITY_THRESHOLDS = np.array([3.0, 5.0])
+_VOLATILITY_POINTS = np.array([0, 1, 2])
+_VOLUME_RATIO_THRESHOLDS = np.array([2.0, 3.0])
+_VOLUME_RATIO_POINTS = np.array([0, 1, 2])
+_RISK_SCORE_THRESHOLDS = np.array([4.0, 7.0])
+_RISK_LABELS = ('Low', 'Medium', 'High')
+
 class PhaseAnalyzer:
     def __init__(self):
         self.phase_thresholds = {
@@ -24,8 +37,16 @@ class PhaseAnalyzer:
         Analyze the current market phase based on multiple indicators.
         Returns the current phase and relevant metrics.
         """
-        current_phase = self._determine_phase(btc_data, dominance_data)
-        metrics = self._calculate_phase_metrics(btc_data, dominance_data)
+        # Compute the shared indicators once; the helpers previously each
+        # recomputed the full rolling series on the same DataFrame.
+        # to_numpy()[-1] skips pandas' label-resolution machinery so the
+        # helpers work on plain floats
+        rsi = float(calculate_rsi(btc_data).to_numpy()[-1])
+        volume_ratio = self._calculate_volume_ratio(btc_data)
+        btc_dominance = float(dominance_data['btc_dominance'].to_numpy()[-1])
+
+        current_phase = self._determine_phase(btc_data, btc_dominance, rsi, volume_ratio)
+        metrics = self._calculate_phase_metrics(btc_data, btc_dominance, rsi, volume_ratio)
         recommendations = self._generate_recommendations(current_phase)
         
         return {
@@ -34,49 +55,50 @@ class PhaseAnalyzer:
             'recommendations': recommendations
         }
 
-    def _determine_phase(self, 
-                        btc_data: pd.DataFrame, 
-                        dominance_data: pd.DataFrame) -> str:
+    def _determine_phase(self,
+                        btc_data: pd.DataFrame,
+                        btc_dominance: float,
+                        rsi: float,
+                        volume_ratio: float) -> str:
         """
-        Determine the current market phase based on indicators.
+        Determine the current market phase from precomputed indicators.
         """
-        # Get latest metrics
-        btc_dominance = dominance_data['btc_dominance'].iloc[-1]
-        rsi = calculate_rsi(btc_data).iloc[-1]
         price_change = self._calculate_price_change(btc_data, window=30)
-        volume_ratio = self._calculate_volume_ratio(btc_data)
-        
-        # Phase determination logic
-        if btc_dominance > self.phase_thresholds['btc_dominance']['high']:
+        dominance_thresholds = self.phase_thresholds['btc_dominance']
+        dominance_high = dominance_thresholds['high']
+        dominance_low = dominance_thresholds['low']
+
+        # Phase determination logic: pure scalar comparisons on locals
+        if btc_dominance > dominance_high:
             return "Phase 1: Bitcoin Dominance"
-        elif (btc_dominance < self.phase_thresholds['btc_dominance']['low'] and 
+        elif (btc_dominance < dominance_low and
               price_change > 0 and volume_ratio > 1.5):
             return "Phase 2: Large Cap Altcoins"
-        elif (btc_dominance < self.phase_thresholds['btc_dominance']['low'] and 
+        elif (btc_dominance < dominance_low and
               volume_ratio > 2.0):
             return "Phase 3: Mid Cap & Sector Rotation"
         else:
             return "Accumulation Phase"
 
-    def _calculate_phase_metrics(self, 
-                               btc_data: pd.DataFrame, 
-                               dominance_data: pd.DataFrame) -> Dict:
+    def _calculate_phase_metrics(self,
+                               btc_data: pd.DataFrame,
+                               btc_dominance: float,
+                               rsi: float,
+                               volume_ratio: float) -> Dict:
         """
         Calculate relevant metrics for phase analysis.
         """
-        # Calculate key metrics
-        rsi = calculate_rsi(btc_data).iloc[-1]
+        # Only the metrics not shared with _determine_phase are computed here
         macd, signal = calculate_macd(btc_data)
         macd_value = macd.iloc[-1]
-        volume_ratio = self._calculate_volume_ratio(btc_data)
         price_volatility = btc_data['price'].pct_change().std() * 100
-        
+
         return {
             'rsi': round(rsi, 2),
             'macd': round(macd_value, 2),
             'volume_ratio': round(volume_ratio, 2),
             'volatility': round(price_volatility, 2),
-            'btc_dominance': round(dominance_data['btc_dominance'].iloc[-1], 2)
+            'btc_dominance': round(btc_dominance, 2)
         }
 
     def _generate_recommendations(self, current_phase: str) -> List[str]:
@@ -134,9 +156,9 @@ class PhaseAnalyzer:
         """
         Get detailed signals for phase transition analysis.
         """
-        rsi = calculate_rsi(btc_data).iloc[-1]
+        rsi = float(calculate_rsi(btc_data).to_numpy()[-1])
         volume_ratio = self._calculate_volume_ratio(btc_data)
-        btc_dominance = dominance_data['btc_dominance'].iloc[-1]
+        btc_dominance = float(dominance_data['btc_dominance'].to_numpy()[-1])
         
         signals = {
             'momentum': {
@@ -159,35 +181,19 @@ class PhaseAnalyzer:
         """
         Calculate current market risk level based on metrics.
         """
-        risk_score = 0
-        
-        # RSI risk factor
-        if metrics['rsi'] > 80:
-            risk_score += 3
-        elif metrics['rsi'] > 70:
-            risk_score += 2
-        elif metrics['rsi'] < 30:
+        # Each if/elif ladder collapses to one threshold-table lookup;
+        # oversold RSI contributes on the low side separately
+        risk_score = int(
+            _RSI_HIGH_POINTS[np.searchsorted(_RSI_HIGH_THRESHOLDS, metrics['rsi'])] +
+            _VOLATILITY_POINTS[np.searchsorted(_VOLATILITY_THRESHOLDS, metrics['volatility'])] +
+            _VOLUME_RATIO_POINTS[np.searchsorted(_VOLUME_RATIO_THRESHOLDS, metrics['volume_ratio'])]
+        )
+        if metrics['rsi'] < 30:
             risk_score += 1
-        
-        # Volatility risk factor
-        if metrics['volatility'] > 5:
-            risk_score += 2
-        elif metrics['volatility'] > 3:
-            risk_score += 1
-        
-        # Volume risk factor
-        if metrics['volume_ratio'] > 3:
-            risk_score += 2
-        elif metrics['volume_ratio'] > 2:
-            risk_score += 1
-        
+
         # Normalize risk score (0-10 scale)
         normalized_score = min(risk_score / 7 * 10, 10)
-        
-        # Risk levels
-        if normalized_score >= 7:
-            return "High", normalized_score
-        elif normalized_score >= 4:
-            return "Medium", normalized_score
-        else:
-            return "Low", normalized_score
+
+        # 'right' keeps the original inclusive >= boundaries for the labels
+        label = _RISK_LABELS[np.searchsorted(_RISK_SCORE_THRESHOLDS, normalized_score, side='right')]
+        return label, normalized_score
@@ -1,7 +1,28 @@
 import numpy as np
 import pandas as pd
 from typing import Tuple, List, Dict
-from datetime import datetime, timedelta
+
+def _sma_last(prices: np.ndarray, window: int) -> float:
+    """Last value of a rolling mean, from the tail slice alone.
+
+    Matches Series.rolling(window).mean().iloc[-1], including the NaN
+    for series shorter than the window.
+    """
+    if prices.size < window:
+        return float('nan')
+    return float(prices[-window:].mean())
+
+def _ewm_last(prices: np.ndarray, span: int) -> float:
+    """Last value of an adjust=False EWM without materializing the series.
+
+    The recursion unrolls to one decayed weight per sample, evaluated as
+    a single dot product instead of an N-point intermediate Series.
+    """
+    alpha = 2.0 / (span + 1.0)
+    decay = np.power(1.0 - alpha, np.arange(prices.size - 1, -1, -1, dtype=np.float64))
+    weights = alpha * decay
+    weights[0] = decay[0]  # the seed value keeps its full weight
+    return float(weights @ prices)
 
 class PricePredictor:
     def __init__(self):
@@ -12,99 +33,95 @@ class PricePredictor:
         }
     
     def predict(self, data: pd.DataFrame, forecast_days: int = 7) -> Dict[str, pd.DataFrame]:
-        """Generate predictions using multiple models."""
+        """Generate predictions using multiple models.
+
+        The price column, last price and forecast index are materialized
+        once and shared across the models, so the series is extracted
+        and the index built a single time per call instead of once per
+        model.
+        """
+        price_series = data['price']
+        last_price = float(price_series.to_numpy()[-1])
+        future_dates = pd.date_range(
+            start=data.index[-1] + pd.Timedelta(days=1),
+            periods=forecast_days,
+            freq='D'
+        )
+
         predictions = {}
-        
+
         for model_name, predict_func in self.models.items():
             try:
-                pred_df = predict_func(data, forecast_days)
+                pred_df = predict_func(price_series, last_price, future_dates, forecast_days)
                 predictions[model_name] = pred_df
             except Exception as e:
                 print(f"Error in {model_name} prediction: {str(e)}")
                 continue
-        
+
         return predictions
-    
-    def _predict_sma(self, data: pd.DataFrame, forecast_days: int) -> pd.DataFrame:
+
+    def _predict_sma(self, price_series: pd.Series, last_price: float,
+                     future_dates: pd.DatetimeIndex, forecast_days: int) -> pd.DataFrame:
         """Predict using Simple Moving Average."""
-        # Calculate short and long term SMAs
-        short_sma = data['price'].rolling(window=7).mean()
-        long_sma = data['price'].rolling(window=21).mean()
-        
+        # Only the last trend value feeds the forecast, so take the two
+        # window means from the tail slices instead of materializing
+        # full rolling series
+        prices = price_series.to_numpy(np.float64)
+        short_sma = _sma_last(prices, 7)
+        long_sma = _sma_last(prices, 21)
+
         # Calculate trend
         trend = (short_sma - long_sma) / long_sma
-        
-        # Generate future dates
-        last_date = data.index[-1]
-        future_dates = [last_date + timedelta(days=x) for x in range(1, forecast_days + 1)]
-        
-        # Predict future values based on trend
-        last_price = data['price'].iloc[-1]
-        predictions = []
-        current_price = last_price
-        
-        for _ in range(forecast_days):
-            change = current_price * trend.iloc[-1]
-            current_price += change
-            predictions.append(current_price)
-        
+
+        # Compounding at a constant rate is a geometric series; the
+        # closed form replaces the day-by-day Python loop
+        k = np.arange(1, forecast_days + 1, dtype=np.float64)
+        predictions = last_price * np.power(1.0 + trend, k)
+
         return pd.DataFrame({
             'price': predictions,
             'model': 'SMA'
         }, index=future_dates)
-    
-    def _predict_ema(self, data: pd.DataFrame, forecast_days: int) -> pd.DataFrame:
+
+    def _predict_ema(self, price_series: pd.Series, last_price: float,
+                     future_dates: pd.DatetimeIndex, forecast_days: int) -> pd.DataFrame:
         """Predict using Exponential Moving Average."""
-        # Calculate EMAs
-        ema_short = data['price'].ewm(span=7, adjust=False).mean()
-        ema_long = data['price'].ewm(span=21, adjust=False).mean()
-        
+        # Only the final EMA values matter, so evaluate each as one dot
+        # product rather than building two full EWM series
+        prices = price_series.to_numpy(np.float64)
+        ema_short = _ewm_last(prices, 7)
+        ema_long = _ewm_last(prices, 21)
+
         # Calculate momentum
         momentum = (ema_short - ema_long) / ema_long
-        
-        # Generate future dates
-        last_date = data.index[-1]
-        future_dates = [last_date + timedelta(days=x) for x in range(1, forecast_days + 1)]
-        
-        # Predict future values
-        last_price = data['price'].iloc[-1]
-        predictions = []
-        current_price = last_price
-        
-        for _ in range(forecast_days):
-            change = current_price * momentum.iloc[-1]
-            current_price += change
-            predictions.append(current_price)
-        
+
+        # Same closed-form compounding as the SMA predictor
+        k = np.arange(1, forecast_days + 1, dtype=np.float64)
+        predictions = last_price * np.power(1.0 + momentum, k)
+
         return pd.DataFrame({
             'price': predictions,
             'model': 'EMA'
         }, index=future_dates)
-    
-    def _predict_momentum(self, data: pd.DataFrame, forecast_days: int) -> pd.DataFrame:
+
+    def _predict_momentum(self, price_series: pd.Series, last_price: float,
+                          future_dates: pd.DatetimeIndex, forecast_days: int) -> pd.DataFrame:
         """Predict using Price Momentum."""
         # Calculate price changes
-        price_changes = data['price'].pct_change()
-        
+        price_changes = price_series.pct_change()
+
         # Calculate momentum indicators
         momentum = price_changes.rolling(window=7).mean()
         volatility = price_changes.rolling(window=14).std()
-        
-        # Generate future dates
-        last_date = data.index[-1]
-        future_dates = [last_date + timedelta(days=x) for x in range(1, forecast_days + 1)]
-        
-        # Predict future values
-        last_price = data['price'].iloc[-1]
-        predictions = []
-        current_price = last_price
-        
-        for _ in range(forecast_days):
-            # Add momentum and adjust for volatility
-            change = current_price * (momentum.iloc[-1] + np.random.normal(0, volatility.iloc[-1]))
-            current_price += change
-            predictions.append(max(0, current_price))  # Ensure non-negative prices
-        
+
+        # Predict future values: one vectorized draw plus a cumulative
+        # product of growth factors replaces the day-by-day Python loop
+        # (default_rng is also faster than the legacy np.random calls)
+        rng = np.random.default_rng()
+        shocks = rng.normal(momentum.iloc[-1], volatility.iloc[-1], size=forecast_days)
+        predictions = last_price * np.cumprod(1.0 + shocks)
+        np.maximum(predictions, 0, out=predictions)  # Ensure non-negative prices
+
         return pd.DataFrame({
             'price': predictions,
             'model': 'Momentum'
@@ -113,23 +130,27 @@ class PricePredictor:
     def get_prediction_metrics(self, predictions: Dict[str, pd.DataFrame], actual_data: pd.DataFrame) -> Dict[str, Dict[str, float]]:
         """Calculate prediction accuracy metrics."""
         metrics = {}
-        
+
+        # Pull the actual series out once; each model then aligns with a
+        # boolean mask and the error math runs on contiguous float arrays
+        # instead of label-aligned Series arithmetic
+        actual_np = actual_data['price'].to_numpy(np.float64)
+        actual_idx = actual_data.index
+
         for model_name, pred_df in predictions.items():
             if pred_df.empty:
                 continue
-                
+
             # Calculate error metrics where we have actual data
-            overlap_idx = pred_df.index.intersection(actual_data.index)
-            if len(overlap_idx) > 0:
-                actual = actual_data.loc[overlap_idx, 'price']
-                predicted = pred_df.loc[overlap_idx, 'price']
-                
-                mape = np.mean(np.abs((actual - predicted) / actual)) * 100
-                rmse = np.sqrt(np.mean((actual - predicted) ** 2))
-                
+            mask = actual_idx.isin(pred_df.index)
+            if mask.any():
+                actual = actual_np[mask]
+                predicted = pred_df['price'].reindex(actual_idx[mask]).to_numpy(np.float64)
+
+                diff = actual - predicted
                 metrics[model_name] = {
-                    'mape': mape,
-                    'rmse': rmse
+                    'mape': float(np.mean(np.abs(diff / actual)) * 100),
+                    'rmse': float(np.sqrt(np.mean(diff * diff)))
                 }
-        
+
         return metrics
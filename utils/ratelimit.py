@@ -0,0 +1,60 @@
+import threading
+import time
+from typing import Dict
+
+
+class TokenBucket:
+    """Thread-safe token bucket for admission control ahead of an API host.
+
+    ccxt's enableRateLimit throttles per exchange *instance*; with several
+    worker threads hitting the same host those per-instance limiters don't
+    coordinate and the host still sees bursts. A shared bucket per host
+    gives every thread one admission gate, so the aggregate request rate
+    stays under the host's limit.
+    """
+
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self.capacity = float(capacity)
+        self.refill_per_sec = float(refill_per_sec)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Block until the requested tokens are available, then consume them."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.refill_per_sec
+                )
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.refill_per_sec
+            time.sleep(wait)
+
+
+# Conservative defaults per host; CoinGecko's free tier is the tightest
+_DEFAULT_RATES = {
+    'coingecko': (5.0, 0.5),  # burst 5, ~30 requests/minute sustained
+}
+_FALLBACK_RATE = (10.0, 2.0)
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def bucket_for(host: str) -> TokenBucket:
+    """Return the shared bucket for a host, creating it on first use."""
+    bucket = _buckets.get(host)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get(host)
+            if bucket is None:
+                capacity, refill = _DEFAULT_RATES.get(host, _FALLBACK_RATE)
+                bucket = TokenBucket(capacity, refill)
+                _buckets[host] = bucket
+    return bucket